@@ -27,11 +27,12 @@ category for the Chinese market.
 # pylint: disable=too-many-branches, invalid-name
 
 from typing import TYPE_CHECKING
-import base64
-import re
+import binascii
+import functools
 import time
-from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.parse import parse_qs, quote_plus, urlparse
 from lxml import html
+from lxml.etree import XPath
 import babel
 import babel.languages
 
@@ -70,14 +71,45 @@ verification by a cookie is needed / thats not possible in SearXNG.
 base_url = 'https://www.bing.com/search'
 """Bing (Web) search URL"""
 
+time_range_dict = {'day': '1', 'week': '2', 'month': '3'}
+"""Bing's ``ez`` filter codes, the code for ``year`` is a range of unix days
+and is calculated per request."""
 
-def _page_offset(pageno):
-    return (int(pageno) - 1) * 10 + 1
+_urlsafe_b64_table = str.maketrans('-_', '+/')
+"""Translates the base64url alphabet to the standard base64 alphabet."""
+
+_non_digits = bytes(range(256)).translate(None, b'0123456789')
+"""All bytes except the ASCII digits, to delete them by ``bytes.translate``."""
+
+# only the results with a link (the title of the result)
+xpath_results = XPath('//ol[@id="b_results"]/li[contains(@class, "b_algo") and .//h2/a]')
+xpath_link = XPath('.//h2/a')
+# text nodes of the result's content, without the text of the icon:
+#  <span class="algoSlug_icon" # data-priority="2">Web</span>
+# The text following the icon (the tail of the span) is part of the content.
+xpath_content_text = XPath('.//p//text()[not(ancestor::span[@class="algoSlug_icon"])]')
+xpath_result_count = XPath('string(//span[@class="sb_count"])')
+
+xpath_language_hrefs = XPath('//div[@id="language-section"]//li/a/@href')
+xpath_region_hrefs = XPath('//div[@id="region-section"]//li/a/@href')
+
+
+def _page_offset(pageno: int) -> int:
+    return pageno * 10 - 9
+
+
+@functools.lru_cache(maxsize=None)
+def _locale_parse(identifier: str) -> babel.Locale:
+    return babel.Locale.parse(identifier)
+
+
+@functools.lru_cache(maxsize=512)
+def _bing_cookies(engine_language, engine_region):
+    return f'm={engine_region}&u={engine_language}', f'mkt={engine_region}&ui={engine_language}'
 
 
 def set_bing_cookies(params, engine_language, engine_region):
-    params['cookies']['_EDGE_CD'] = f'm={engine_region}&u={engine_language}'
-    params['cookies']['_EDGE_S'] = f'mkt={engine_region}&ui={engine_language}'
+    params['cookies']['_EDGE_CD'], params['cookies']['_EDGE_S'] = _bing_cookies(engine_language, engine_region)
     logger.debug("bing cookies: %s", params['cookies'])
 
 
@@ -88,32 +120,30 @@ def request(query, params):
     engine_language = traits.get_language(params['searxng_locale'], 'en')  # type: ignore
     set_bing_cookies(params, engine_language, engine_region)
 
-    page = params.get('pageno', 1)
-    query_params = {
-        'q': query,
-        # if arg 'pq' is missed, somtimes on page 4 we get results from page 1,
-        # don't ask why it is only sometimes / its M$ and they have never been
-        # deterministic ;)
-        'pq': query,
-    }
+    page = int(params.get('pageno', 1))
+    q = quote_plus(query)
+    # if arg 'pq' is missed, somtimes on page 4 we get results from page 1,
+    # don't ask why it is only sometimes / its M$ and they have never been
+    # deterministic ;)
+    params['url'] = f'{base_url}?q={q}&pq={q}'
 
     # To get correct page, arg first and this arg FORM is needed, the value PERE
     # is on page 2, on page 3 its PERE1 and on page 4 its PERE2 .. and so forth.
     # The 'first' arg should never send on page 1.
 
     if page > 1:
-        query_params['first'] = _page_offset(page)  # see also arg FORM
+        params['url'] += f'&first={_page_offset(page)}'  # see also arg FORM
     if page == 2:
-        query_params['FORM'] = 'PERE'
+        params['url'] += '&FORM=PERE'
     elif page > 2:
-        query_params['FORM'] = 'PERE%s' % (page - 2)
+        params['url'] += f'&FORM=PERE{page - 2}'
 
-    params['url'] = f'{base_url}?{urlencode(query_params)}'
-
-    if params.get('time_range'):
-        unix_day = int(time.time() / 86400)
-        time_ranges = {'day': '1', 'week': '2', 'month': '3', 'year': f'5_{unix_day-365}_{unix_day}'}
-        params['url'] += f'&filters=ex1:"ez{time_ranges[params["time_range"]]}"'
+    time_range = params.get('time_range')
+    if time_range == 'year':
+        unix_day = time.time_ns() // 86_400_000_000_000
+        params['url'] += f'&filters=ex1:"ez5_{unix_day-365}_{unix_day}"'
+    elif time_range:
+        params['url'] += f'&filters=ex1:"ez{time_range_dict[time_range]}"'
 
     return params
 
@@ -124,51 +154,47 @@ def response(resp):
     results = []
     result_len = 0
 
-    dom = html.fromstring(resp.text)
-
-    # parse results again if nothing is found yet
+    # comments and processing instructions are not needed and the ID hash
+    # table of libxml2 is not built
+    parser = html.HTMLParser(
+        encoding=resp.encoding or 'utf-8', remove_comments=True, remove_pis=True, collect_ids=False
+    )
+    dom = html.fromstring(resp.content, parser=parser)
 
-    for result in eval_xpath_list(dom, '//ol[@id="b_results"]/li[contains(@class, "b_algo")]'):
+    for result in eval_xpath_list(dom, xpath_results):
 
-        link = eval_xpath_getindex(result, './/h2/a', 0, None)
-        if link is None:
-            continue
+        link = eval_xpath_getindex(result, xpath_link, 0)
         url = link.attrib.get('href')
         title = extract_text(link)
 
-        content = eval_xpath(result, './/p')
-        for p in content:
-            # Make sure that the element is free of:
-            #  <span class="algoSlug_icon" # data-priority="2">Web</span>
-            for e in p.xpath('.//span[@class="algoSlug_icon"]'):
-                e.getparent().remove(e)
-        content = extract_text(content)
+        content = ' '.join(''.join(eval_xpath(result, xpath_content_text)).split())
 
         # get the real URL
         if url.startswith('https://www.bing.com/ck/a?'):
-            # get the first value of u parameter
-            url_query = urlparse(url).query
-            parsed_url_query = parse_qs(url_query)
-            param_u = parsed_url_query["u"][0]
-            # remove "a1" in front
-            encoded_url = param_u[2:]
-            # add padding
-            encoded_url = encoded_url + '=' * (-len(encoded_url) % 4)
-            # decode base64 encoded URL
-            url = base64.urlsafe_b64decode(encoded_url).decode()
+            # get the first value of u parameter, the value is base64url
+            # encoded and does not need to be unquoted
+            for param in url.partition('?')[2].split('&'):
+                if param.startswith('u='):
+                    # remove "u=a1" in front
+                    encoded_url = param[4:]
+                    # add padding
+                    encoded_url = encoded_url + '=' * (-len(encoded_url) % 4)
+                    # decode base64 encoded URL
+                    url = binascii.a2b_base64(encoded_url.translate(_urlsafe_b64_table)).decode()
+                    break
 
         # append result
         results.append({'url': url, 'title': title, 'content': content})
 
     # get number_of_results
     try:
-        result_len_container = "".join(eval_xpath(dom, '//span[@class="sb_count"]//text()'))
+        result_len_container = eval_xpath(dom, xpath_result_count)
         if "-" in result_len_container:
 
             # Remove the part "from-to" for paginated request ...
             result_len_container = result_len_container[result_len_container.find("-") * 2 + 2 :]
 
-        result_len_container = re.sub('[^0-9]', '', result_len_container)
+        result_len_container = result_len_container.encode('ascii', 'ignore').translate(None, _non_digits)
 
         if len(result_len_container) > 0:
             result_len = int(result_len_container)
@@ -187,6 +213,17 @@ def response(resp):
     return results
 
 
+_map_lang = {'prs': 'fa-AF', 'en': 'en-us'}
+_bing_ui_lang_map = {
+    # HINT: this list probably needs to be supplemented
+    'en': 'us',  # en --> en-us
+    'da': 'dk',  # da --> da-dk
+}
+_map_market_codes = {
+    'zh-hk': 'en-hk',  # not sure why, but at M$ this is the market code for Hongkong
+}
+
+
 def fetch_traits(engine_traits: EngineTraits):
     """Fetch languages and regions from Bing-Web."""
     # pylint: disable=import-outside-toplevel
@@ -203,18 +240,11 @@ def fetch_traits(engine_traits: EngineTraits):
 
     engine_traits.languages['zh'] = 'zh-hans'
 
-    map_lang = {'prs': 'fa-AF', 'en': 'en-us'}
-    bing_ui_lang_map = {
-        # HINT: this list probably needs to be supplemented
-        'en': 'us',  # en --> en-us
-        'da': 'dk',  # da --> da-dk
-    }
-
-    for href in eval_xpath(dom, '//div[@id="language-section"]//li/a/@href'):
+    for href in eval_xpath(dom, xpath_language_hrefs):
         eng_lang = parse_qs(urlparse(href).query)['setlang'][0]
-        babel_lang = map_lang.get(eng_lang, eng_lang)
+        babel_lang = _map_lang.get(eng_lang, eng_lang)
         try:
-            sxng_tag = language_tag(babel.Locale.parse(babel_lang.replace('-', '_')))
+            sxng_tag = language_tag(_locale_parse(babel_lang.replace('-', '_')))
         except babel.UnknownLocaleError:
             print("ERROR: language (%s) is unknown by babel" % (babel_lang))
             continue
@@ -224,7 +254,7 @@ def fetch_traits(engine_traits: EngineTraits):
         # 'pt-pt' and 'pt-br' --> 'pt-br'
         bing_ui_lang = eng_lang.lower()
         if '-' not in bing_ui_lang:
-            bing_ui_lang = bing_ui_lang + '-' + bing_ui_lang_map.get(bing_ui_lang, bing_ui_lang)
+            bing_ui_lang = bing_ui_lang + '-' + _bing_ui_lang_map.get(bing_ui_lang, bing_ui_lang)
 
         conflict = engine_traits.languages.get(sxng_tag)
         if conflict:
@@ -237,10 +267,7 @@ def fetch_traits(engine_traits: EngineTraits):
 
     engine_traits.regions['zh-CN'] = 'zh-cn'
 
-    map_market_codes = {
-        'zh-hk': 'en-hk',  # not sure why, but at M$ this is the market code for Hongkong
-    }
-    for href in eval_xpath(dom, '//div[@id="region-section"]//li/a/@href'):
+    for href in eval_xpath(dom, xpath_region_hrefs):
         cc_tag = parse_qs(urlparse(href).query)['cc'][0]
         if cc_tag == 'clear':
             engine_traits.all_locale = cc_tag
@@ -248,14 +275,14 @@ def fetch_traits(engine_traits: EngineTraits):
 
         # add market codes from official languages of the country ..
         for lang_tag in babel.languages.get_official_languages(cc_tag, de_facto=True):
-            if lang_tag not in engine_traits.languages.keys():
+            if lang_tag not in engine_traits.languages:
                 # print("ignore lang: %s <-- %s" % (cc_tag, lang_tag))
                 continue
             lang_tag = lang_tag.split('_')[0]  # zh_Hant --> zh
             market_code = f"{lang_tag}-{cc_tag}"  # zh-tw
 
-            market_code = map_market_codes.get(market_code, market_code)
-            sxng_tag = region_tag(babel.Locale.parse('%s_%s' % (lang_tag, cc_tag.upper())))
+            market_code = _map_market_codes.get(market_code, market_code)
+            sxng_tag = region_tag(_locale_parse('%s_%s' % (lang_tag, cc_tag.upper())))
             conflict = engine_traits.regions.get(sxng_tag)
             if conflict:
                 if conflict != market_code:
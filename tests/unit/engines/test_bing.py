@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring
+
+from collections import defaultdict
+import mock
+
+from searx.engines import bing
+from searx.enginelib.traits import EngineTraits
+from searx import logger
+
+from tests import SearxTestCase
+
+logger = logger.getChild('engines')
+
+
+class TestBingEngine(SearxTestCase):  # pylint: disable=missing-class-docstring
+    html = """
+    <html><body>
+    <ol id="b_results">
+        <li class="b_algo">
+            <h2><a href="https://www.bing.com/ck/a?p=1&amp;u=a1aHR0cHM6Ly9leGFtcGxlLm9yZy8_cT3DvH4">Result 1</a></h2>
+            <p>Content 1</p>
+        </li>
+        <li class="b_algo">
+            <h2><a href="https://www.bing.com/ck/a?!&amp;&amp;p=abc&amp;ntb=1">Result 2</a></h2>
+            <p>Content 2</p>
+        </li>
+        <li class="b_algo">
+            <h2>Result without a link</h2>
+            <p>Content without a link</p>
+        </li>
+        <li class="b_algo">
+            <h2><a href="https://example.org/plain">Result 3</a></h2>
+            <p>Content 3</p>
+        </li>
+    </ol>
+    </body></html>
+    """
+
+    def setUp(self):
+        bing.logger = logger.getChild('test_bing')
+        bing.traits = EngineTraits(all_locale='clear')
+
+    def _request(self, query, pageno=1, time_range=None):
+        params = defaultdict(dict)
+        params['searxng_locale'] = 'all'
+        params['pageno'] = pageno
+        params['time_range'] = time_range
+        return bing.request(query, params)
+
+    def test_request(self):
+        params = self._request('test_query')
+        self.assertEqual(params['url'], 'https://www.bing.com/search?q=test_query&pq=test_query')
+
+        params = self._request('test_query', pageno=2)
+        self.assertEqual(params['url'], 'https://www.bing.com/search?q=test_query&pq=test_query&first=11&FORM=PERE')
+
+        params = self._request('test_query', pageno=3)
+        self.assertEqual(params['url'], 'https://www.bing.com/search?q=test_query&pq=test_query&first=21&FORM=PERE1')
+
+        # request() converts pageno to int, _page_offset() expects an int
+        params = self._request('test_query', pageno='3')
+        self.assertEqual(params['url'], 'https://www.bing.com/search?q=test_query&pq=test_query&first=21&FORM=PERE1')
+
+        # quoted like urlencode() does
+        params = self._request('a b&c+d ü')
+        self.assertEqual(params['url'], 'https://www.bing.com/search?q=a+b%26c%2Bd+%C3%BC&pq=a+b%26c%2Bd+%C3%BC')
+
+    def test_request_time_range(self):
+        params = self._request('test_query', time_range='day')
+        self.assertEqual(params['url'], 'https://www.bing.com/search?q=test_query&pq=test_query&filters=ex1:"ez1"')
+
+        with mock.patch.object(bing.time, 'time_ns', return_value=20000 * 86_400_000_000_000 + 1):
+            params = self._request('test_query', time_range='year')
+        self.assertEqual(
+            params['url'], 'https://www.bing.com/search?q=test_query&pq=test_query&filters=ex1:"ez5_19635_20000"'
+        )
+
+    def _response(self, html, pageno=1):
+        resp = mock.Mock(content=html.encode('utf-8'), encoding='utf-8', search_params={'pageno': pageno})
+        return bing.response(resp)
+
+    def test_response(self):
+        results = self._response(self.html)
+        self.assertEqual(type(results), list)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0]['title'], 'Result 1')
+        self.assertEqual(results[0]['content'], 'Content 1')
+        self.assertEqual(results[2]['title'], 'Result 3')
+        self.assertEqual(results[2]['url'], 'https://example.org/plain')
+        self.assertEqual(results[2]['content'], 'Content 3')
+        self.assertEqual(results[3], {'number_of_results': 0})
+
+    def test_response_content(self):
+        html = self.html.replace(
+            '<p>Content 1</p>', '<p><span class="algoSlug_icon" data-priority="2">Web</span>After icon text</p>'
+        )
+        results = self._response(html)
+        self.assertEqual(results[0]['content'], 'After icon text')
+
+    def test_response_without_link(self):
+        # items without a h2/a are not selected by the results XPath
+        results = self._response(self.html)
+        self.assertNotIn('Content without a link', [r.get('content') for r in results])
+
+    def test_response_redirect_url(self):
+        results = self._response(self.html)
+        # base64url encoded value of the u parameter without its padding
+        self.assertEqual(results[0]['url'], 'https://example.org/?q=ü~')
+        # a redirect URL without a u parameter is kept as it is
+        self.assertEqual(results[1]['url'], 'https://www.bing.com/ck/a?!&&p=abc&ntb=1')
+
+    def test_response_number_of_results(self):
+        html = self.html.replace('</ol>', '</ol><span class="sb_count">About 1.230 results</span>')
+        results = self._response(html)
+        self.assertEqual(results[-1], {'number_of_results': 1230})
+
+        # paginated request: the "from-to" part is removed
+        html = self.html.replace('</ol>', '</ol><span class="sb_count">11-20 of 1,230 results</span>')
+        results = self._response(html, pageno=2)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[-1], {'number_of_results': 1230})
+
+        # the requested page is out of the range of the results
+        results = self._response(html, pageno=200)
+        self.assertEqual(results, [])